@@ -14,13 +14,42 @@ References:
 """
 
 import argparse
+import asyncio
 import json
 import logging
+import mmap
 import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
-import difflib
+
+# Shared helpers live in scripts/netops_common.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from netops_common import netmiko_connection, write_json
+
+try:
+    # C implementation of difflib.SequenceMatcher, much faster on large configs
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
+try:
+    # SIMD-accelerated and several times faster than SHA-256; fingerprints
+    # only detect changes, so a non-standard hash is fine
+    from blake3 import blake3 as fingerprint_hash
+    FINGERPRINT_NAME = 'blake3'
+except ImportError:
+    from hashlib import sha256 as fingerprint_hash
+    FINGERPRINT_NAME = 'sha256'
+
+# git provides a histogram diff, which handles repetitive config lines better than Myers
+GIT = shutil.which('git')
 
 try:
     from netmiko import ConnectHandler
@@ -29,13 +58,221 @@ except ImportError:
     print("⚠ Netmiko not installed. Install with: pip install netmiko")
     ConnectHandler = None
 
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+try:
+    # Faster parsing of JSON inventories and encoding of backup index lines
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Fields every inventory device must define
+INVENTORY_REQUIRED_FIELDS = ('device_type', 'host')
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a unified diff hunk range ('start,length')"""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
+
+
+def _group_opcodes(codes: List[tuple], n: int):
+    """Split opcodes into hunks with n lines of context, as SequenceMatcher.get_grouped_opcodes"""
+    if not codes:
+        codes = [('equal', 0, 1, 0, 1)]
+
+    # Trim unchanged lines at either end down to the context
+    if codes[0][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == 'equal':
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        # A long unchanged run ends one hunk and starts the next
+        if tag == 'equal' and i2 - i1 > 2 * n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+
+    if group and not (len(group) == 1 and group[0][0] == 'equal'):
+        yield group
+
+
+def unified_diff(a: List[str], b: List[str], fromfile: str = '', tofile: str = '',
+                 n: int = 3):
+    """
+    Unified diff of two line lists, equivalent to difflib.unified_diff
+
+    Uses cdifflib's C SequenceMatcher when it is installed and falls back
+    to the pure-Python difflib matcher otherwise. Lines common to the start
+    and end of both configs are trimmed first, so only the changed region
+    is fed to the matcher; they are added back as unchanged runs before
+    the hunks are formed, so every hunk keeps its full n lines of context.
+    """
+    # Common prefix/suffix, as GNU diff does before running its algorithm
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    a_end = len(a) - suffix
+    b_end = len(b) - suffix
+    matcher = SequenceMatcher(None, a[prefix:a_end], b[prefix:b_end])
+
+    codes = [('equal', 0, prefix, 0, prefix)]
+    codes += [
+        (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+    ]
+    codes.append(('equal', a_end, len(a), b_end, len(b)))
+
+    # Merge neighbouring unchanged runs and drop empty ones
+    merged = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == 'equal':
+            if i1 == i2:
+                continue
+            if merged and merged[-1][0] == 'equal':
+                _, i1, _, j1, _ = merged.pop()
+        merged.append((tag, i1, i2, j1, j2))
+
+    started = False
+    for group in _group_opcodes(merged, n):
+        if not started:
+            started = True
+            yield f'--- {fromfile}\n'
+            yield f'+++ {tofile}\n'
+
+        first, last = group[0], group[-1]
+        file1_range = _format_range(first[1], last[2])
+        file2_range = _format_range(first[3], last[4])
+        yield f'@@ -{file1_range} +{file2_range} @@\n'
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in a[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in ('replace', 'delete'):
+                for line in a[i1:i2]:
+                    yield '-' + line
+            if tag in ('replace', 'insert'):
+                for line in b[j1:j2]:
+                    yield '+' + line
+
+
+def load_inventory(inventory_file: str) -> List[Dict]:
+    """
+    Load and validate the device list of an inventory file
+
+    JSON is parsed with orjson when installed; YAML (.yml/.yaml, libyaml
+    loader when available) and MessagePack (.msgpack, via msgspec)
+    inventories are accepted too. Files that do not parse, and devices
+    missing a required field, are rejected here with a ValueError, before
+    any device is contacted.
+    """
+    path = Path(inventory_file)
+    suffix = path.suffix.lower()
+
+    if suffix in ('.yml', '.yaml'):
+        if yaml is None:
+            raise ValueError("PyYAML is required for YAML inventories (pip install pyyaml)")
+        try:
+            with open(path) as f:
+                inventory = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        except yaml.YAMLError as e:
+            raise ValueError(f"Malformed YAML: {e}") from e
+    elif suffix == '.msgpack':
+        if msgspec is None:
+            raise ValueError("msgspec is required for MessagePack inventories (pip install msgspec)")
+        try:
+            inventory = msgspec.msgpack.decode(path.read_bytes())
+        except msgspec.DecodeError as e:
+            raise ValueError(f"Malformed MessagePack: {e}") from e
+    elif orjson is not None:
+        inventory = orjson.loads(path.read_bytes())
+    else:
+        with open(path, 'r') as f:
+            inventory = json.load(f)
+
+    if inventory is None:
+        inventory = {}
+    if not isinstance(inventory, dict):
+        raise ValueError("Inventory is not a mapping with a 'devices' list")
+
+    devices = inventory.get('devices') or []
+    if not isinstance(devices, list):
+        raise ValueError("Inventory 'devices' is not a list")
+
+    for index, device in enumerate(devices, 1):
+        if not isinstance(device, dict):
+            raise ValueError(f"Inventory device #{index} is not a mapping")
+        missing = [field for field in INVENTORY_REQUIRED_FIELDS if not device.get(field)]
+        if missing:
+            raise ValueError(f"Inventory device #{index} is missing: {', '.join(missing)}")
+
+    return devices
+
+
+def json_line(record: Dict) -> str:
+    """Serialize a record as one line of a JSON-lines file"""
+    if orjson is not None:
+        return orjson.dumps(record).decode() + '\n'
+    return json.dumps(record) + '\n'
+
+
 class NetworkDeviceBackup:
     """Automated network device configuration backup"""
 
-    def __init__(self, backup_dir: str = "backups"):
+    # Command that prints the running configuration, per device type
+    _COMMANDS = {
+        'cisco_ios': 'show running-config',
+        'cisco_nxos': 'show running-config',
+        'cisco_asa': 'show running-config',
+        'cisco_xr': 'show running-config',
+        'arista_eos': 'show running-config',
+        'juniper': 'show configuration | display set',
+        'juniper_junos': 'show configuration | display set',
+        'hp_comware': 'display current-configuration',
+        'hp_procurve': 'show running-config',
+        'dell_force10': 'show running-config',
+        'paloalto_panos': 'show config running',
+    }
+
+    def __init__(self, backup_dir: str = "backups", generate_diffs: bool = False):
         self.backup_dir = Path(backup_dir)
         self.backup_dir.mkdir(parents=True, exist_ok=True)
 
+        # Write a .diff file next to every changed backup
+        self.generate_diffs = generate_diffs
+
         # Setup logging
         self.logger = logging.getLogger('NetworkBackup')
         self.logger.setLevel(logging.INFO)
@@ -50,8 +287,18 @@ class NetworkDeviceBackup:
             'devices_backed_up': 0,
             'devices_failed': 0,
             'changes_detected': 0,
-            'backups': []
+            'backups_file': None
         }
+        self._results_lock = threading.Lock()
+
+        # Per-device backup records are streamed to a JSON-lines file as
+        # they complete, so memory use does not grow with the inventory
+        self._backups_file = self.backup_dir / f"backups_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        self._backup_stream = None
+
+        # Latest (filename, config) per device, saves re-reading it from disk
+        # for the next diff; only filled when diffs are generated
+        self._last_backup: Dict[str, tuple] = {}
 
     def backup_device(self, device_info: Dict) -> Dict:
         """
@@ -76,40 +323,20 @@ class NetworkDeviceBackup:
 
         try:
             # Connect to device
-            connection = ConnectHandler(**device_info)
+            with netmiko_connection(device_info) as connection:
+                # Get hostname from device
+                if device_type.startswith('cisco'):
+                    actual_hostname = connection.find_prompt().strip('#>')
+                else:
+                    actual_hostname = hostname.replace('.', '_')
 
-            # Get hostname from device
-            if device_type.startswith('cisco'):
-                actual_hostname = connection.find_prompt().strip('#>')
-            else:
-                actual_hostname = hostname.replace('.', '_')
-
-            # Get configuration based on device type
-            config = self._get_configuration(connection, device_type)
+                # Get configuration based on device type
+                config = self._get_configuration(connection, device_type)
 
             # Save backup
             backup_result = self._save_backup(actual_hostname, config)
 
-            # Disconnect
-            connection.disconnect()
-
-            print(f"    ✓ Backup completed: {backup_result['filename']}")
-            if backup_result['changed']:
-                print(f"    ⚠ Configuration changed since last backup")
-
-            self.results['devices_backed_up'] += 1
-            if backup_result['changed']:
-                self.results['changes_detected'] += 1
-
-            self.results['backups'].append({
-                'hostname': actual_hostname,
-                'ip': hostname,
-                'device_type': device_type,
-                'status': 'success',
-                'filename': backup_result['filename'],
-                'changed': backup_result['changed'],
-                'size': backup_result['size']
-            })
+            self._record_success(actual_hostname, hostname, device_type, backup_result)
 
             return {'status': 'success', 'result': backup_result}
 
@@ -117,41 +344,128 @@ class NetworkDeviceBackup:
             error = f"Connection timeout to {hostname}"
             print(f"    ✗ {error}")
             self.logger.error(error)
-            self.results['devices_failed'] += 1
+            self._record_failure()
             return {'status': 'failed', 'error': error}
 
         except NetmikoAuthenticationException:
             error = f"Authentication failed for {hostname}"
             print(f"    ✗ {error}")
             self.logger.error(error)
-            self.results['devices_failed'] += 1
+            self._record_failure()
             return {'status': 'failed', 'error': error}
 
         except Exception as e:
             error = f"Error backing up {hostname}: {str(e)}"
             print(f"    ✗ {error}")
             self.logger.error(error)
-            self.results['devices_failed'] += 1
+            self._record_failure()
             return {'status': 'failed', 'error': error}
 
+    def close(self):
+        """Close the backup records file"""
+        with self._results_lock:
+            if self._backup_stream is not None:
+                self._backup_stream.close()
+                self._backup_stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def backup_device_async(self, device_info: Dict, semaphore: asyncio.Semaphore) -> Dict:
+        """
+        Backup configuration from a single network device over asyncssh
+
+        Runs the configuration command on an SSH exec channel, so thousands
+        of devices can be in flight on one event loop. Devices that need
+        enable mode ('secret'), or all devices when asyncssh is not
+        installed, go through the Netmiko path in a worker thread instead.
+
+        Args:
+            device_info: Same dictionary as backup_device()
+            semaphore: Bounds the number of concurrent SSH sessions
+        """
+        if asyncssh is None or device_info.get('secret'):
+            async with semaphore:
+                return await asyncio.to_thread(self.backup_device, device_info)
+
+        hostname = device_info.get('host')
+        device_type = device_info.get('device_type')
+
+        async with semaphore:
+            print(f"\n[*] Backing up {hostname} ({device_type})...")
+            self.logger.info(f"Starting backup for {hostname}")
+
+            try:
+                async with asyncssh.connect(
+                    hostname,
+                    port=device_info.get('port', 22),
+                    username=device_info.get('username'),
+                    password=device_info.get('password'),
+                    known_hosts=None
+                ) as connection:
+                    command = self._COMMANDS.get(device_type, 'show running-config')
+                    result = await connection.run(command, check=True)
+                    config = result.stdout
+
+                # Get hostname from configuration
+                match = re.search(r'^hostname (\S+)', config, re.MULTILINE)
+                if device_type.startswith('cisco') and match:
+                    actual_hostname = match.group(1)
+                else:
+                    actual_hostname = hostname.replace('.', '_')
+
+                backup_result = await asyncio.to_thread(self._save_backup, actual_hostname, config)
+                self._record_success(actual_hostname, hostname, device_type, backup_result)
+
+                return {'status': 'success', 'result': backup_result}
+
+            except Exception as e:
+                error = f"Error backing up {hostname}: {str(e)}"
+                print(f"    ✗ {error}")
+                self.logger.error(error)
+                self._record_failure()
+                return {'status': 'failed', 'error': error}
+
+    def _record_success(self, actual_hostname: str, hostname: str, device_type: str,
+                        backup_result: Dict):
+        """Report and count a successful device backup"""
+
+        print(f"    ✓ Backup completed: {backup_result['filename']}")
+        if backup_result['changed']:
+            print(f"    ⚠ Configuration changed since last backup")
+
+        record = json_line({
+            'hostname': actual_hostname,
+            'ip': hostname,
+            'device_type': device_type,
+            'status': 'success',
+            'filename': backup_result['filename'],
+            'changed': backup_result['changed'],
+            'size': backup_result['size']
+        })
+
+        with self._results_lock:
+            self.results['devices_backed_up'] += 1
+            if backup_result['changed']:
+                self.results['changes_detected'] += 1
+
+            if self._backup_stream is None:
+                self._backup_stream = open(self._backups_file, 'w')
+                self.results['backups_file'] = str(self._backups_file)
+            self._backup_stream.write(record)
+
+    def _record_failure(self):
+        """Count a failed device backup"""
+        with self._results_lock:
+            self.results['devices_failed'] += 1
+
     def _get_configuration(self, connection, device_type: str) -> str:
         """Get configuration based on device type"""
 
-        commands = {
-            'cisco_ios': 'show running-config',
-            'cisco_nxos': 'show running-config',
-            'cisco_asa': 'show running-config',
-            'cisco_xr': 'show running-config',
-            'arista_eos': 'show running-config',
-            'juniper': 'show configuration | display set',
-            'juniper_junos': 'show configuration | display set',
-            'hp_comware': 'display current-configuration',
-            'hp_procurve': 'show running-config',
-            'dell_force10': 'show running-config',
-            'paloalto_panos': 'show config running',
-        }
-
-        command = commands.get(device_type, 'show running-config')
+        command = self._COMMANDS.get(device_type, 'show running-config')
 
         # Send command
         output = connection.send_command(command, delay_factor=2)
@@ -159,7 +473,16 @@ class NetworkDeviceBackup:
         return output
 
     def _save_backup(self, hostname: str, config: str) -> Dict:
-        """Save backup and detect changes"""
+        """
+        Save backup and detect changes
+
+        Changes are detected by comparing fingerprints (BLAKE3 when
+        installed, otherwise SHA-256): the latest backup's fingerprint is
+        kept alongside it, so an unchanged configuration is detected
+        without writing a new file or reading the previous one. The
+        previous configuration is only read when a diff file is requested
+        (generate_diffs).
+        """
 
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -167,68 +490,205 @@ class NetworkDeviceBackup:
         device_dir = self.backup_dir / hostname
         device_dir.mkdir(exist_ok=True)
 
+        latest_link = device_dir / f"{hostname}_latest.cfg"
+        hash_file = device_dir / f"{hostname}_latest.{FINGERPRINT_NAME}"
+        config_bytes = config.encode()
+        config_hash = fingerprint_hash(config_bytes).hexdigest()
+
+        # Fingerprint of the latest backup (hashed from the file itself for
+        # backups taken before fingerprints, or with another hash, were kept)
+        previous_hash = None
+        if latest_link.exists():
+            if hash_file.exists():
+                previous_hash = hash_file.read_text().strip()
+            else:
+                previous_hash = fingerprint_hash(latest_link.read_bytes()).hexdigest()
+
+        # Configuration unchanged - keep the existing backup
+        if previous_hash == config_hash:
+            latest_file = device_dir / os.readlink(latest_link)
+            if self.generate_diffs:
+                self._last_backup[hostname] = (latest_file, config)
+            return {
+                'filename': str(latest_file),
+                'changed': False,
+                'size': latest_file.stat().st_size
+            }
+
+        changed = previous_hash is not None
+
+        # Previous backup for the diff - cached from an earlier run of this
+        # process, or the file the latest symlink points to
+        previous_file = None
+        previous_config = None
+        if changed and self.generate_diffs:
+            if hostname in self._last_backup:
+                previous_file, previous_config = self._last_backup[hostname]
+            else:
+                previous_file = device_dir / os.readlink(latest_link)
+
         # Current backup filename
         current_file = device_dir / f"{hostname}_{timestamp}.cfg"
 
-        # Save current backup
-        with open(current_file, 'w') as f:
-            f.write(config)
+        # Save current backup - a link to a content-addressed object, so
+        # devices with identical configs share one copy on disk
+        blob = self._store_object(config_hash, config_bytes)
+        if current_file.is_symlink():
+            # Second backup within the same second replaces the first
+            current_file.unlink()
+        current_file.symlink_to(os.path.relpath(blob, device_dir))
 
-        # Create/update latest symlink
-        latest_link = device_dir / f"{hostname}_latest.cfg"
-        if latest_link.exists():
+        # Create/update latest symlink and fingerprint
+        if latest_link.is_symlink() or latest_link.exists():
             latest_link.unlink()
         latest_link.symlink_to(current_file.name)
+        hash_file.write_text(config_hash + '\n')
+        if self.generate_diffs:
+            self._last_backup[hostname] = (current_file, config)
 
-        # Check for changes
-        changed = False
-        previous_files = sorted(device_dir.glob(f"{hostname}_*.cfg"))
+        # Generate diff
+        if previous_file is not None:
+            diff_file = device_dir / f"{hostname}_{timestamp}.diff"
+            diff = self._compute_diff(previous_file, current_file, previous_config, config)
 
-        if len(previous_files) > 1:
-            # Compare with previous backup
-            previous_file = previous_files[-2]
-
-            with open(previous_file, 'r') as f:
-                previous_config = f.read()
-
-            if config != previous_config:
-                changed = True
-
-                # Generate diff
-                diff_file = device_dir / f"{hostname}_{timestamp}.diff"
-                diff = difflib.unified_diff(
-                    previous_config.splitlines(keepends=True),
-                    config.splitlines(keepends=True),
-                    fromfile=str(previous_file),
-                    tofile=str(current_file)
-                )
-
-                with open(diff_file, 'w') as f:
-                    f.writelines(diff)
+            with open(diff_file, 'w') as f:
+                f.write(diff)
 
         return {
             'filename': str(current_file),
             'changed': changed,
-            'size': current_file.stat().st_size
+            'size': len(config_bytes)
         }
 
-    def backup_from_inventory(self, inventory_file: str):
-        """Backup all devices from inventory file"""
+    def _compute_diff(self, previous_file: Path, current_file: Path,
+                      previous_config: Optional[str], current_config: str) -> str:
+        """
+        Unified diff between two backups
+
+        Prefers `git diff --histogram`: configs are full of repeated lines
+        ('!', 'interface ...', 'exit') that drive Myers-style diffs towards
+        their worst case. git reads both files itself; only the fallback to
+        unified_diff() without git splits the configs into lines, reading
+        the previous backup from disk unless it is already in memory.
+        """
+        if GIT:
+            result = subprocess.run(
+                [GIT, 'diff', '--no-index', '--histogram', '--no-color', '--no-ext-diff',
+                 str(previous_file.resolve()), str(current_file.resolve())],
+                capture_output=True,
+                text=True
+            )
+
+            # Exit status 1 means the files differ
+            if result.returncode in (0, 1):
+                # Replace git's own header with the usual ---/+++ lines
+                _, found, hunks = result.stdout.partition('\n@@')
+                if not found:
+                    return ''
+                return f"--- {previous_file}\n+++ {current_file}\n@@{hunks}"
+
+        if previous_config is not None:
+            previous_lines = previous_config.splitlines(keepends=True)
+        else:
+            previous_lines = self._read_lines(previous_file)
+
+        return ''.join(unified_diff(
+            previous_lines,
+            current_config.splitlines(keepends=True),
+            fromfile=str(previous_file),
+            tofile=str(current_file)
+        ))
+
+    def _store_object(self, config_hash: str, data: bytes) -> Path:
+        """
+        Store a configuration under objects/<hash[:2]>/<hash[2:]>
+
+        Written only if no device has produced the same configuration
+        before. The write goes through a temporary file and a rename, so a
+        concurrent backup of an identical config never sees a partial file.
+        """
+        blob = self.backup_dir / 'objects' / config_hash[:2] / config_hash[2:]
+
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = blob.with_name(f"{blob.name}.{threading.get_ident()}.tmp")
+            self._write_file(temp_file, data)
+            os.replace(temp_file, blob)
+
+        return blob
+
+    @staticmethod
+    def _write_file(path: Path, data: bytes):
+        """Write bytes straight to a file descriptor, bypassing the text I/O layer"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_lines(path: Path) -> List[str]:
+        """
+        Read a backup as lines from a memory map, without building the whole string first
+
+        The previous backup is read once and never again by this process, so
+        the kernel is told to drop it from the page cache afterwards; this
+        keeps fleet-wide runs from filling the cache with old configs.
+        """
+        with open(path, 'rb') as f:
+            fd = f.fileno()
+            if os.fstat(fd).st_size == 0:
+                return []
+
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                lines = [line.decode() for line in iter(mapped.readline, b'')]
+
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+            return lines
+
+    def backup_from_inventory(self, inventory_file: str, workers: int = 16,
+                              use_async: bool = False):
+        """
+        Backup all devices from inventory file
+
+        Devices are backed up concurrently; each worker opens its own
+        Netmiko session, so no connection state is shared between threads.
+        With use_async, devices are backed up on an asyncio event loop
+        instead and workers bounds the number of concurrent SSH sessions.
+        """
 
         print(f"\n[*] Loading inventory from {inventory_file}...")
 
-        with open(inventory_file, 'r') as f:
-            inventory = json.load(f)
+        try:
+            devices = load_inventory(inventory_file)
+        except ValueError as e:
+            print(f"    ✗ Invalid inventory: {e}")
+            self.logger.error(f"Invalid inventory {inventory_file}: {e}")
+            return
 
-        devices = inventory.get('devices', [])
         print(f"    Found {len(devices)} device(s) in inventory")
 
-        for device in devices:
-            self.backup_device(device)
+        if use_async:
+            asyncio.run(self._backup_all_async(devices, workers))
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                list(executor.map(self.backup_device, devices))
 
         # Generate summary report
         self._generate_report()
 
+    async def _backup_all_async(self, devices: List[Dict], concurrency: int):
+        """Backup devices on the event loop, at most `concurrency` at a time"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        await asyncio.gather(*(self.backup_device_async(device, semaphore) for device in devices))
+
     def _generate_report(self):
         """Generate backup summary report"""
 
@@ -239,19 +699,24 @@ class NetworkDeviceBackup:
         print(f"Devices failed: {self.results['devices_failed']}")
         print(f"Changes detected: {self.results['changes_detected']}")
 
+        with self._results_lock:
+            if self._backup_stream is not None:
+                self._backup_stream.flush()
+
         # Save JSON report
         report_file = self.backup_dir / f"backup_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        write_json(report_file, self.results)
 
         print(f"\nReport saved: {report_file}")
 
         # List changed devices
         if self.results['changes_detected'] > 0:
             print(f"\nDevices with configuration changes:")
-            for backup in self.results['backups']:
-                if backup['changed']:
-                    print(f"  - {backup['hostname']} ({backup['ip']})")
+            with open(self._backups_file) as f:
+                for line in f:
+                    backup = json.loads(line)
+                    if backup['changed']:
+                        print(f"  - {backup['hostname']} ({backup['ip']})")
 
 
 def main():
@@ -263,6 +728,9 @@ Examples:
   # Backup from inventory file
   python network-device-backup.py --inventory devices.json
 
+  # Backup a large inventory over asyncssh, 200 sessions at a time
+  python network-device-backup.py --inventory devices.json --async --workers 200
+
   # Backup single device
   python network-device-backup.py --host 192.168.1.1 --type cisco_ios --user admin
 
@@ -286,12 +754,18 @@ Sample inventory.json:
         """
     )
 
-    parser.add_argument('--inventory', help='JSON inventory file with device list')
+    parser.add_argument('--inventory', help='Inventory file with device list (JSON, YAML or MessagePack)')
     parser.add_argument('--host', help='Single device IP address')
     parser.add_argument('--type', help='Device type (cisco_ios, juniper_junos, etc.)')
     parser.add_argument('--user', help='Username')
     parser.add_argument('--password', help='Password')
     parser.add_argument('--backup-dir', default='backups', help='Backup directory')
+    parser.add_argument('--workers', type=int, default=16,
+                        help='Number of devices to back up concurrently (default: 16)')
+    parser.add_argument('--generate-diffs', action='store_true',
+                        help='Write a unified diff file for every changed configuration')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Use asyncssh on an event loop instead of threads (large inventories)')
 
     args = parser.parse_args()
 
@@ -300,7 +774,7 @@ Sample inventory.json:
         print("Install with: pip install netmiko")
         return 1
 
-    backup = NetworkDeviceBackup(args.backup_dir)
+    backup = NetworkDeviceBackup(args.backup_dir, generate_diffs=args.generate_diffs)
 
     print("""
 ╔═══════════════════════════════════════════════════════════════════╗
@@ -309,20 +783,22 @@ Sample inventory.json:
 ╚═══════════════════════════════════════════════════════════════════╝
     """)
 
-    if args.inventory:
-        backup.backup_from_inventory(args.inventory)
-    elif args.host and args.type:
-        device_info = {
-            'device_type': args.type,
-            'host': args.host,
-            'username': args.user or input("Username: "),
-            'password': args.password or input("Password: ")
-        }
-        backup.backup_device(device_info)
-        backup._generate_report()
-    else:
-        parser.print_help()
-        return 1
+    with backup:
+        if args.inventory:
+            backup.backup_from_inventory(args.inventory, workers=args.workers,
+                                         use_async=args.use_async)
+        elif args.host and args.type:
+            device_info = {
+                'device_type': args.type,
+                'host': args.host,
+                'username': args.user or input("Username: "),
+                'password': args.password or input("Password: ")
+            }
+            backup.backup_device(device_info)
+            backup._generate_report()
+        else:
+            parser.print_help()
+            return 1
 
     return 0
 
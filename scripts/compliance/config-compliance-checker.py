@@ -15,22 +15,73 @@ References:
 import argparse
 import json
 import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set
+
+# Shared helpers live in scripts/netops_common.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from netops_common import netmiko_connection, write_json
 
 try:
     from netmiko import ConnectHandler
 except ImportError:
     ConnectHandler = None
 
+try:
+    # Linear-time (DFA) regex engine, no backtracking on large configs
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # Multi-literal matching in a single pass over the config
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# A pattern containing none of these is a plain literal
+REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+
+def compile_pattern(pattern: str):
+    """Compile a case-insensitive, multiline check pattern, preferring RE2"""
+    if re2 is not None:
+        try:
+            return re2.compile(f'(?im){pattern}')
+        except re2.error:
+            # Construct not supported by RE2 - use the stdlib engine
+            pass
+    return re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+
+
 class ConfigComplianceChecker:
     """Network configuration compliance checker"""
 
-    def __init__(self, output_dir: str = "compliance_reports"):
+    # Score weight of a check, based on its severity
+    SEVERITY_WEIGHTS = {
+        'critical': 10,
+        'high': 5,
+        'medium': 3,
+        'low': 1
+    }
+
+    def __init__(self, output_dir: str = "compliance_reports", backup_dir: str = None,
+                 count_matches: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.results = []
+        self._results_lock = threading.Lock()
+
+        # Directory of network-device-backup.py backups, checked before
+        # connecting to a device
+        self.backup_dir = Path(backup_dir) if backup_dir else None
+
+        # Report how many times each check matched (costs a full scan per passed check)
+        self.count_matches = count_matches
 
         # Security best practices checks
         self.checks = {
@@ -86,6 +137,59 @@ class ConfigComplianceChecker:
             ]
         }
 
+        self._compile_checks()
+
+    def _compile_checks(self):
+        """
+        Precompile check patterns and severity weights
+
+        RE2 is used when installed. With pyahocorasick installed, the
+        plain-literal patterns of each device type also go into one
+        Aho-Corasick automaton, which finds all of them in a single pass.
+        """
+        self._automata = {}
+        self._literal_checks = {}
+
+        for device_type, checks in self.checks.items():
+            literals = {}
+
+            for i, check in enumerate(checks):
+                check['_re'] = compile_pattern(check['pattern'])
+                check['weight'] = self.SEVERITY_WEIGHTS.get(check['severity'], 1)
+
+                if ahocorasick is not None and not REGEX_METACHARACTERS.intersection(check['pattern']):
+                    literals.setdefault(check['pattern'].lower(), []).append(i)
+
+            if literals:
+                automaton = ahocorasick.Automaton()
+                for literal, indices in literals.items():
+                    automaton.add_word(literal, indices)
+                automaton.make_automaton()
+                self._automata[device_type] = automaton
+                self._literal_checks[device_type] = {i for indices in literals.values() for i in indices}
+
+    def _matched_checks(self, config: str, device_type: str) -> Set[int]:
+        """
+        Find which checks of a device type match a config
+
+        Literal checks are decided by the automaton's single pass; every
+        other check stops at its first match rather than scanning on.
+        """
+
+        matched = set()
+        literal_checks = self._literal_checks.get(device_type, set())
+
+        automaton = self._automata.get(device_type)
+        if automaton is not None:
+            for _, indices in automaton.iter(config.lower()):
+                matched.update(indices)
+
+        for i, check in enumerate(self.checks.get(device_type, [])):
+            if i not in literal_checks and check['_re'].search(config):
+                matched.add(i)
+
+        return matched
+
     def check_device_compliance(self, device_info: Dict, config: str = None) -> Dict:
         """Check device configuration compliance"""
 
@@ -94,12 +198,14 @@ class ConfigComplianceChecker:
 
         print(f"\n[*] Checking compliance for {hostname} ({device_type})...")
 
+        if config is None and self.backup_dir is not None:
+            config = self._load_backup(device_info)
+
         if config is None:
             # Fetch configuration
             try:
-                connection = ConnectHandler(**device_info)
-                config = connection.send_command('show running-config')
-                connection.disconnect()
+                with netmiko_connection(device_info) as connection:
+                    config = connection.send_command('show running-config')
             except Exception as e:
                 print(f"    ✗ Error fetching config: {e}")
                 return {'status': 'error', 'error': str(e)}
@@ -116,9 +222,10 @@ class ConfigComplianceChecker:
         }
 
         checks = self.checks.get(device_type, [])
+        matched = self._matched_checks(config, device_type)
 
-        for check in checks:
-            result = self._run_check(config, check)
+        for i, check in enumerate(checks):
+            result = self._run_check(config, check, i in matched)
             compliance_results['checks'].append(result)
 
             if result['passed']:
@@ -154,36 +261,55 @@ class ConfigComplianceChecker:
             for check in failed[:5]:  # Show first 5
                 print(f"      - {check['name']} ({check['severity']})")
 
-        self.results.append(compliance_results)
+        with self._results_lock:
+            self.results.append(compliance_results)
 
         return compliance_results
 
-    def _run_check(self, config: str, check: Dict) -> Dict:
-        """Run a single compliance check"""
+    def _load_backup(self, device_info: Dict) -> str:
+        """
+        Latest saved configuration of a device from the backup directory
 
-        pattern = check['pattern']
-        matches = re.findall(pattern, config, re.MULTILINE | re.IGNORECASE)
+        Backups are stored under the device hostname, or the host address
+        with dots replaced by underscores; an inventory entry can name the
+        directory explicitly with a 'hostname' key. Returns None when no
+        backup exists.
+        """
+        host = device_info.get('host') or ''
+        names = [device_info.get('hostname'), host, host.replace('.', '_')]
 
-        passed = len(matches) > 0
+        for name in filter(None, names):
+            latest_file = self.backup_dir / name / f"{name}_latest.cfg"
+            if latest_file.exists():
+                print(f"    Using saved configuration: {latest_file}")
+                return latest_file.read_text()
 
-        # Assign weight based on severity
-        weight_map = {
-            'critical': 10,
-            'high': 5,
-            'medium': 3,
-            'low': 1
-        }
-        weight = weight_map.get(check['severity'], 1)
+        return None
+
+    def _run_check(self, config: str, check: Dict, matched: bool) -> Dict:
+        """
+        Build the result of a single compliance check
 
-        return {
+        Args:
+            matched: Whether the check matched, from _matched_checks()
+
+        The number of matches takes a full scan of the config, so it is
+        only reported when the checker was created with count_matches.
+        """
+
+        result = {
             'name': check['name'],
             'severity': check['severity'],
             'required': check.get('required', False),
-            'passed': passed,
-            'matches': len(matches),
-            'weight': weight
+            'passed': matched,
+            'weight': check['weight']
         }
 
+        if self.count_matches:
+            result['matches'] = len(check['_re'].findall(config)) if matched else 0
+
+        return result
+
     def check_from_file(self, config_file: str, device_type: str) -> Dict:
         """Check compliance from configuration file"""
 
@@ -222,8 +348,7 @@ class ConfigComplianceChecker:
 
         # Save JSON report
         report_file = self.output_dir / f"compliance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        write_json(report_file, summary)
 
         print(f"    ✓ Report saved: {report_file}")
 
@@ -249,16 +374,24 @@ def main():
     parser.add_argument('--config-file', help='Configuration file to check')
     parser.add_argument('--device-type', default='cisco_ios', help='Device type')
     parser.add_argument('--output-dir', default='compliance_reports', help='Output directory')
+    parser.add_argument('--workers', type=int, default=16,
+                        help='Number of devices to check concurrently (default: 16)')
+    parser.add_argument('--backup-dir',
+                        help='Check saved backups from network-device-backup.py first, '
+                             'connecting only to devices without one')
+    parser.add_argument('--count-matches', action='store_true',
+                        help='Report how many times each check matched (slower)')
 
     args = parser.parse_args()
 
-    if not ConnectHandler and not args.config_file:
+    if not ConnectHandler and not (args.config_file or args.backup_dir):
         print("\nError: Netmiko required for live device checks")
         print("Install with: pip install netmiko")
         print("Or use --config-file to check saved configurations")
         return 1
 
-    checker = ConfigComplianceChecker(args.output_dir)
+    checker = ConfigComplianceChecker(args.output_dir, backup_dir=args.backup_dir,
+                                      count_matches=args.count_matches)
 
     print("""
 ╔═══════════════════════════════════════════════════════════════════╗
@@ -274,8 +407,9 @@ def main():
         with open(args.inventory, 'r') as f:
             inventory = json.load(f)
 
-        for device in inventory.get('devices', []):
-            checker.check_device_compliance(device)
+        # One Netmiko session per device, fetched concurrently
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            list(executor.map(checker.check_device_compliance, inventory.get('devices', [])))
 
         checker.generate_report()
     else:
@@ -4,79 +4,231 @@ Network Configuration Compliance Checker
 Validates network device configurations against security and operational standards.
 """
 
+import os
 import re
+import sys
+import threading
 import yaml
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
 from napalm import get_network_driver
 from typing import Dict, List
 
+# Shared helpers live in netops_common.py, next to this script
+from netops_common import DEVICE_TIMEOUT, default_workers
+
+try:
+    # Matches all literal needles in a single pass over the config
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Remote syslog host, e.g. 'logging 10.0.0.5'
+_LOGGING_RE = re.compile(rb'logging \d+\.\d+\.\d+\.\d+')
+
+# SSH enabled on the VTY lines or configured globally
+_SSH_RE = re.compile(rb'transport input ssh|ip ssh')
+
+
+@lru_cache(maxsize=None)
+def _driver_for(device_type):
+    """Return the NAPALM driver class for a device type, resolved once."""
+    return get_network_driver(device_type)
+
+
+@lru_cache(maxsize=1)
+def _parse_inventory(inventory_file, mtime_ns, size):
+    """
+    Parse a YAML inventory with libyaml's C loader when available.
+
+    Cached in memory on the file's mtime and size, so an unchanged file is
+    parsed once per process; callers must not modify the result.
+    """
+    with open(inventory_file) as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+class DeviceSessionPool:
+    """Keep NAPALM sessions open between uses, keyed by (hostname, username)."""
+
+    def __init__(self, max_sessions=64):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # key -> [device or None, lock]
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def get(self, device_info):
+        """
+        Yield an open session for a device, opening one if needed.
+
+        Each session is used by one thread at a time. A session that raises
+        is closed and dropped, so the next use reconnects.
+        """
+        key = (device_info['hostname'], device_info['username'])
+
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = self._sessions[key] = [None, threading.Lock()]
+            self._sessions.move_to_end(key)
+            evicted = self._evict()
+
+        for device in evicted:
+            self._close_device(device)
+
+        with entry[1]:
+            if entry[0] is None:
+                device = _driver_for(device_info['device_type'])(
+                    hostname=device_info['hostname'],
+                    username=device_info['username'],
+                    password=device_info['password'],
+                    optional_args={
+                        'conn_timeout': DEVICE_TIMEOUT,
+                        'banner_timeout': DEVICE_TIMEOUT,
+                        'auth_timeout': DEVICE_TIMEOUT
+                    }
+                )
+                device.open()
+                entry[0] = device
+
+            try:
+                yield entry[0]
+            except Exception:
+                device, entry[0] = entry[0], None
+                self._close_device(device)
+                raise
+
+    def _evict(self):
+        """Drop least recently used idle sessions beyond max_sessions (caller holds the pool lock)."""
+        evicted = []
+        for key in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            entry = self._sessions[key]
+            # Skip sessions that are in use
+            if entry[1].acquire(blocking=False):
+                try:
+                    del self._sessions[key]
+                    if entry[0] is not None:
+                        evicted.append(entry[0])
+                    entry[0] = None
+                finally:
+                    entry[1].release()
+        return evicted
+
+    @staticmethod
+    def _close_device(device):
+        try:
+            device.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close all pooled sessions."""
+        with self._lock:
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+
+        for entry in entries:
+            with entry[1]:
+                if entry[0] is not None:
+                    self._close_device(entry[0])
+                    entry[0] = None
+
+
 class ConfigComplianceChecker:
     """Check network configurations for compliance."""
 
     def __init__(self):
         self.compliance_rules = self.load_compliance_rules()
+        self._needles = self._build_needle_index()
+        self._by_type = self._compile_rules()
         self.results = []
+        self._results_lock = threading.Lock()
+        self.sessions = DeviceSessionPool()
 
     def load_compliance_rules(self):
-        """Load compliance rules."""
+        """
+        Load compliance rules.
+
+        Each rule has a 'kind': 'in' passes when its literal 'pattern'
+        occurs in the config, 'not_in' when it does not, and 'regex' when
+        its compiled 'pattern' matches. Rules with 'case_insensitive': True
+        are evaluated against the lowercased config. Patterns work on the
+        config as bytes.
+        """
         return {
             'cisco_ios': [
                 {
                     'name': 'No IP Source Routing',
-                    'check': lambda config: 'no ip source-route' in config,
+                    'kind': 'in',
+                    'pattern': b'no ip source-route',
                     'severity': 'high',
                     'description': 'IP source routing should be disabled'
                 },
                 {
                     'name': 'Service Password Encryption',
-                    'check': lambda config: 'service password-encryption' in config,
+                    'kind': 'in',
+                    'pattern': b'service password-encryption',
                     'severity': 'high',
                     'description': 'Password encryption should be enabled'
                 },
                 {
                     'name': 'Enable Secret Configured',
-                    'check': lambda config: 'enable secret' in config,
+                    'kind': 'in',
+                    'pattern': b'enable secret',
                     'severity': 'critical',
                     'description': 'Enable secret must be configured'
                 },
                 {
                     'name': 'AAA Authentication',
-                    'check': lambda config: 'aaa new-model' in config,
+                    'kind': 'in',
+                    'pattern': b'aaa new-model',
                     'severity': 'high',
                     'description': 'AAA should be configured for authentication'
                 },
                 {
                     'name': 'Logging Enabled',
-                    'check': lambda config: re.search(r'logging \d+\.\d+\.\d+\.\d+', config),
+                    'kind': 'regex',
+                    'pattern': _LOGGING_RE,
                     'severity': 'medium',
                     'description': 'Centralized logging should be configured'
                 },
                 {
                     'name': 'NTP Configured',
-                    'check': lambda config: 'ntp server' in config,
+                    'kind': 'in',
+                    'pattern': b'ntp server',
                     'severity': 'medium',
                     'description': 'NTP should be configured for accurate time'
                 },
                 {
                     'name': 'SNMP Community Not Public',
-                    'check': lambda config: 'snmp-server community public' not in config.lower(),
+                    'kind': 'not_in',
+                    'pattern': b'snmp-server community public',
+                    'case_insensitive': True,
                     'severity': 'critical',
                     'description': 'Default SNMP community should not be used'
                 },
                 {
                     'name': 'SSH Configured',
-                    'check': lambda config: 'transport input ssh' in config or 'ip ssh' in config,
+                    'kind': 'regex',
+                    'pattern': _SSH_RE,
                     'severity': 'high',
                     'description': 'SSH should be configured and Telnet disabled'
                 },
                 {
                     'name': 'No Telnet',
-                    'check': lambda config: 'transport input telnet' not in config,
+                    'kind': 'not_in',
+                    'pattern': b'transport input telnet',
                     'severity': 'high',
                     'description': 'Telnet should be disabled'
                 },
                 {
                     'name': 'Banner Configured',
-                    'check': lambda config: 'banner' in config,
+                    'kind': 'in',
+                    'pattern': b'banner',
                     'severity': 'low',
                     'description': 'Login banner should be configured'
                 },
@@ -84,37 +236,145 @@ class ConfigComplianceChecker:
             'junos': [
                 {
                     'name': 'Root Authentication',
-                    'check': lambda config: 'root-authentication' in config,
+                    'kind': 'in',
+                    'pattern': b'root-authentication',
                     'severity': 'critical',
                     'description': 'Root authentication must be configured'
                 },
                 {
                     'name': 'SSH Service Enabled',
-                    'check': lambda config: 'system services ssh' in config,
+                    'kind': 'in',
+                    'pattern': b'system services ssh',
                     'severity': 'high',
                     'description': 'SSH service should be enabled'
                 },
                 {
                     'name': 'NTP Configured',
-                    'check': lambda config: 'system ntp' in config,
+                    'kind': 'in',
+                    'pattern': b'system ntp',
                     'severity': 'medium',
                     'description': 'NTP should be configured'
                 },
                 {
                     'name': 'Syslog Configured',
-                    'check': lambda config: 'system syslog' in config,
+                    'kind': 'in',
+                    'pattern': b'system syslog',
                     'severity': 'medium',
                     'description': 'Syslog should be configured'
                 },
             ]
         }
 
+    def _build_needle_index(self):
+        """
+        Collect the literal needles of each device type.
+
+        Needles of case-insensitive rules are kept apart (lowercased) and
+        matched against the lowercased config. With pyahocorasick
+        installed, each group is compiled into one automaton, so a config
+        is scanned once instead of once per needle.
+        """
+        index = {}
+        for device_type, rules in self.compliance_rules.items():
+            for case_insensitive in (False, True):
+                needles = {
+                    rule['pattern'].lower() if case_insensitive else rule['pattern']
+                    for rule in rules
+                    if rule['kind'] != 'regex'
+                    and rule.get('case_insensitive', False) == case_insensitive
+                }
+                if not needles:
+                    continue
+
+                if ahocorasick is not None:
+                    # pyahocorasick's default build matches str only, so
+                    # keys are the decoded needles and the config str is
+                    # scanned as is
+                    automaton = ahocorasick.Automaton()
+                    for needle in needles:
+                        key = needle.decode('utf-8')
+                        automaton.add_word(key.lower() if case_insensitive else key, needle)
+                    automaton.make_automaton()
+                    index[(device_type, case_insensitive)] = automaton
+                else:
+                    index[(device_type, case_insensitive)] = needles
+
+        return index
+
+    def _find_needles(self, device_type, config, config_bytes, config_lower):
+        """
+        Return the set of (needle, case_insensitive) pairs present in a config.
+
+        Automata scan config, the config str, lowercasing it for the
+        case-insensitive automaton like its keys. Plain needle sets scan
+        config_bytes, the UTF-8 encoded config, and config_lower, its
+        lowercased copy; both are None when every group has an automaton.
+        """
+        found = set()
+
+        for case_insensitive in (False, True):
+            needles = self._needles.get((device_type, case_insensitive))
+            if needles is None:
+                continue
+
+            if isinstance(needles, set):
+                haystack = config_lower if case_insensitive else config_bytes
+                found.update((needle, case_insensitive) for needle in needles if needle in haystack)
+            else:
+                # Aho-Corasick automaton
+                haystack = config.lower() if case_insensitive else config
+                found.update((needle, case_insensitive) for _, needle in needles.iter(haystack))
+
+        return found
+
+    def _compile_rules(self):
+        """
+        Lay out each device type's rules as parallel lists plus bitmasks.
+
+        Bit i stands for rule i. 'needle_bits' maps each (needle,
+        case_insensitive) key to the bits of the literal rules using it,
+        and 'not_in_mask' flips the not_in rules, so all literal rules are
+        decided with a few int operations. Only the regex rules in
+        'regexes' are evaluated one by one.
+        """
+        by_type = {}
+        for device_type, rules in self.compliance_rules.items():
+            needle_bits = {}
+            not_in_mask = 0
+            literal_mask = 0
+            regexes = []
+            for i, rule in enumerate(rules):
+                case_insensitive = rule.get('case_insensitive', False)
+                if rule['kind'] == 'regex':
+                    regexes.append((1 << i, rule['pattern'], case_insensitive))
+                    continue
+
+                needle = rule['pattern'].lower() if case_insensitive else rule['pattern']
+                key = (needle, case_insensitive)
+                needle_bits[key] = needle_bits.get(key, 0) | (1 << i)
+                literal_mask |= 1 << i
+                if rule['kind'] == 'not_in':
+                    not_in_mask |= 1 << i
+
+            by_type[device_type] = {
+                'names': [rule['name'] for rule in rules],
+                'severities': [rule['severity'] for rule in rules],
+                'descs': [rule['description'] for rule in rules],
+                'needle_bits': needle_bits,
+                'not_in_mask': not_in_mask,
+                'literal_mask': literal_mask,
+                'regexes': regexes,
+            }
+        return by_type
+
     def check_device_compliance(self, device_info):
         """Check a device for compliance."""
         hostname = device_info['hostname']
         device_type = device_info['device_type']
 
-        print(f"\n🔍 Checking compliance for {hostname} ({device_type})...")
+        # Output is collected and written once per device, so concurrent
+        # workers take the stdout lock once each and never interleave
+        lines = [f"\n🔍 Checking compliance for {hostname} ({device_type})..."]
 
         compliance_report = {
             'hostname': hostname,
@@ -125,68 +385,87 @@ class ConfigComplianceChecker:
         }
 
         try:
-            # Connect to device
-            driver = get_network_driver(device_type)
-            device = driver(
-                hostname=hostname,
-                username=device_info['username'],
-                password=device_info['password']
-            )
-
-            device.open()
-
-            # Get configuration
-            config = device.get_config()
+            # Get configuration over a pooled session
+            with self.sessions.get(device_info) as device:
+                config = device.get_config()
             running_config = config['running']
 
-            device.close()
-
             # Get rules for this device type
-            rules = self.compliance_rules.get(device_type, [])
+            table = self._by_type.get(device_type)
 
-            if not rules:
-                print(f"  ⚠️  No compliance rules defined for {device_type}")
+            if not table or not table['names']:
+                lines.append(f"  ⚠️  No compliance rules defined for {device_type}")
                 compliance_report['not_applicable'].append(
                     f'No rules for device type {device_type}'
                 )
-                self.results.append(compliance_report)
+                with self._results_lock:
+                    self.results.append(compliance_report)
                 return compliance_report
 
-            # Check each rule
-            for rule in rules:
-                try:
-                    if rule['check'](running_config):
-                        compliance_report['passed'].append(rule['name'])
-                        print(f"  ✅ {rule['name']}")
-                    else:
-                        compliance_report['failed'].append({
-                            'rule': rule['name'],
-                            'severity': rule['severity'],
-                            'description': rule['description']
-                        })
-                        print(f"  ❌ {rule['name']} - {rule['severity'].upper()}")
-                except Exception as e:
-                    print(f"  ⚠️  Could not check {rule['name']}: {e}")
+            # Automata scan the config str directly; the plain needle sets
+            # and the regex rules scan bytes, lowercased once for
+            # case-insensitive rules, so those are only built when needed
+            config_bytes = config_lower = None
+            if ahocorasick is None or table['regexes']:
+                config_bytes = running_config.encode('utf-8', 'replace')
+                config_lower = config_bytes.lower()
+
+            # Single pass for all literal needles
+            found = self._find_needles(device_type, running_config, config_bytes, config_lower)
+
+            # Decide literal rules from the hit bits, then run the regex rules
+            needle_bits = table['needle_bits']
+            found_mask = 0
+            for key in found:
+                found_mask |= needle_bits.get(key, 0)
+            passed_mask = (found_mask ^ table['not_in_mask']) & table['literal_mask']
+
+            for bit, pattern, case_insensitive in table['regexes']:
+                if pattern.search(config_lower if case_insensitive else config_bytes):
+                    passed_mask |= bit
+
+            # Report each rule
+            names = table['names']
+            severities = table['severities']
+            descs = table['descs']
+            for i, name in enumerate(names):
+                if passed_mask >> i & 1:
+                    compliance_report['passed'].append(name)
+                    lines.append(f"  ✅ {name}")
+                else:
+                    compliance_report['failed'].append({
+                        'rule': name,
+                        'severity': severities[i],
+                        'description': descs[i]
+                    })
+                    lines.append(f"  ❌ {name} - {severities[i].upper()}")
 
             # Summary for this device
-            total = len(rules)
-            passed = len(compliance_report['passed'])
-            failed = len(compliance_report['failed'])
+            total = len(names)
+            passed = bin(passed_mask).count('1')
 
-            print(f"\n  Compliance Score: {passed}/{total} ({(passed/total*100):.1f}%)")
+            lines.append(f"\n  Compliance Score: {passed}/{total} ({(passed/total*100):.1f}%)")
 
         except Exception as e:
-            print(f"  ❌ Error: {e}")
+            lines.append(f"  ❌ Error: {e}")
             compliance_report['error'] = str(e)
+        finally:
+            sys.stdout.write('\n'.join(lines) + '\n')
 
-        self.results.append(compliance_report)
+        with self._results_lock:
+            self.results.append(compliance_report)
         return compliance_report
 
+    @staticmethod
+    def _load_inventory(inventory_file):
+        """Parse the YAML inventory, reusing the parsed copy while the file is unchanged."""
+        stat = os.stat(inventory_file)
+        return _parse_inventory(inventory_file, stat.st_mtime_ns, stat.st_size)
+
     def check_all_devices(self, inventory_file='tools/inventory/devices.yml'):
         """Check all devices in inventory."""
         try:
-            with open(inventory_file) as f:
-                inventory = yaml.safe_load(f)
+            inventory = self._load_inventory(inventory_file)
         except FileNotFoundError:
             print(f"❌ Inventory file not found: {inventory_file}")
             return
@@ -200,8 +479,21 @@ class ConfigComplianceChecker:
         print(f"Checking compliance for {len(devices)} devices...")
         print("="*80)
 
-        for device in devices:
-            self.check_device_compliance(device)
+        # Devices are checked concurrently, each worker with its own NAPALM session
+        with ThreadPoolExecutor(max_workers=default_workers(len(devices))) as executor:
+            futures = [executor.submit(self.check_device_compliance, device) for device in devices]
+            for future in as_completed(futures):
+                future.result()
+
+    def close(self):
+        """Close pooled device sessions."""
+        self.sessions.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def generate_summary(self):
         """Generate compliance summary report."""
@@ -247,9 +539,9 @@ def main():
 
     args = parser.parse_args()
 
-    checker = ConfigComplianceChecker()
-    checker.check_all_devices(inventory_file=args.inventory)
-    checker.generate_summary()
+    with ConfigComplianceChecker() as checker:
+        checker.check_all_devices(inventory_file=args.inventory)
+        checker.generate_summary()
 
 
 if __name__ == '__main__':
@@ -13,18 +13,62 @@ References:
 """
 
 import argparse
+import asyncio
 import json
+import re
+import sys
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 import subprocess
 
+# Shared helpers live in scripts/netops_common.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from netops_common import default_workers, netmiko_connection, write_json
+
 try:
     from netmiko import ConnectHandler
 except ImportError:
     ConnectHandler = None
 
+try:
+    # Unprivileged ICMP sockets, no ping(8) subprocess per host
+    import icmplib
+except ImportError:
+    icmplib = None
+
+# 'show processes cpu' line carrying the one-minute CPU average
+CPU_ONE_MINUTE_RE = re.compile(r'^.*one minute:\s*(\d+)%.*$', re.MULTILINE)
+
+# 'show memory statistics' processor pool row: head, total and used bytes
+PROCESSOR_MEMORY_RE = re.compile(r'^\s*Processor\s+\S+\s+(\d+)\s+(\d+)', re.MULTILINE | re.IGNORECASE)
+
+# 'show ip interface brief' row: interface, IP, OK?, method, status, protocol
+INTERFACE_BRIEF_RE = re.compile(
+    r'^(\S+)\s+(\S+)\s+(?:YES|NO)\s+\S+\s+(administratively down|\S+)\s+(\S+)\s*$',
+    re.MULTILINE
+)
+
+
+@dataclass(frozen=True)
+class HealthThresholds:
+    """Alert thresholds (percent, error count, degrees C)"""
+
+    cpu_warning: int = 70
+    cpu_critical: int = 90
+    memory_warning: int = 80
+    memory_critical: int = 95
+    interface_errors_warning: int = 100
+    interface_errors_critical: int = 1000
+    temperature_warning: int = 65
+    temperature_critical: int = 75
+
+
 class NetworkHealthMonitor:
     """Network device health monitoring"""
 
@@ -32,14 +76,10 @@ class NetworkHealthMonitor:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.metrics = []
+        self._metrics_lock = threading.Lock()
 
         # Thresholds
-        self.thresholds = {
-            'cpu': {'warning': 70, 'critical': 90},
-            'memory': {'warning': 80, 'critical': 95},
-            'interface_errors': {'warning': 100, 'critical': 1000},
-            'temperature': {'warning': 65, 'critical': 75}
-        }
+        self.thresholds = HealthThresholds()
 
     def check_device_health(self, device_info: Dict) -> Dict:
         """Check health of a network device"""
@@ -50,13 +90,17 @@ class NetworkHealthMonitor:
         print(f"\n[*] Checking health of {hostname} ({device_type})...")
 
         try:
-            connection = ConnectHandler(**device_info)
+            with netmiko_connection(device_info) as connection:
+                # Get actual hostname
+                if device_type.startswith('cisco'):
+                    prompt = connection.find_prompt()
+                    actual_hostname = prompt.strip('#>')
+                else:
+                    prompt = None
+                    actual_hostname = hostname
 
-            # Get actual hostname
-            if device_type.startswith('cisco'):
-                actual_hostname = connection.find_prompt().strip('#>')
-            else:
-                actual_hostname = hostname
+                # Fetch all show output in one round-trip
+                outputs = self._collect_health_bulk(connection, device_type, prompt)
 
             health_data = {
                 'hostname': actual_hostname,
@@ -68,48 +112,53 @@ class NetworkHealthMonitor:
             }
 
             # Check CPU
-            cpu_data = self._check_cpu(connection, device_type)
+            thresholds = self.thresholds
+
+            cpu_data = self._check_cpu(outputs)
             health_data['cpu'] = cpu_data
-            if cpu_data['usage'] >= self.thresholds['cpu']['critical']:
+            cpu_usage = cpu_data['usage']
+            if cpu_usage >= thresholds.cpu_critical:
                 health_data['alerts'].append({
                     'severity': 'critical',
                     'metric': 'cpu',
-                    'message': f"CPU usage critical: {cpu_data['usage']}%"
+                    'message': f"CPU usage critical: {cpu_usage}%"
                 })
                 health_data['status'] = 'critical'
-            elif cpu_data['usage'] >= self.thresholds['cpu']['warning']:
+            elif cpu_usage >= thresholds.cpu_warning:
                 health_data['alerts'].append({
                     'severity': 'warning',
                     'metric': 'cpu',
-                    'message': f"CPU usage high: {cpu_data['usage']}%"
+                    'message': f"CPU usage high: {cpu_usage}%"
                 })
                 if health_data['status'] == 'healthy':
                     health_data['status'] = 'warning'
 
             # Check Memory
-            memory_data = self._check_memory(connection, device_type)
+            memory_data = self._check_memory(outputs)
             health_data['memory'] = memory_data
-            if memory_data['usage_percent'] >= self.thresholds['memory']['critical']:
+            memory_usage = memory_data['usage_percent']
+            if memory_usage >= thresholds.memory_critical:
                 health_data['alerts'].append({
                     'severity': 'critical',
                     'metric': 'memory',
-                    'message': f"Memory usage critical: {memory_data['usage_percent']}%"
+                    'message': f"Memory usage critical: {memory_usage}%"
                 })
                 health_data['status'] = 'critical'
-            elif memory_data['usage_percent'] >= self.thresholds['memory']['warning']:
+            elif memory_usage >= thresholds.memory_warning:
                 health_data['alerts'].append({
                     'severity': 'warning',
                     'metric': 'memory',
-                    'message': f"Memory usage high: {memory_data['usage_percent']}%"
+                    'message': f"Memory usage high: {memory_usage}%"
                 })
 
             # Check Interfaces
-            interface_data = self._check_interfaces(connection, device_type)
+            interface_data = self._check_interfaces(outputs)
             health_data['interfaces'] = interface_data
 
             # Check for interface errors
+            errors_critical = thresholds.interface_errors_critical
             for intf in interface_data:
-                if intf.get('errors', 0) >= self.thresholds['interface_errors']['critical']:
+                if intf.get('errors', 0) >= errors_critical:
                     health_data['alerts'].append({
                         'severity': 'critical',
                         'metric': 'interface_errors',
@@ -124,7 +173,7 @@ class NetworkHealthMonitor:
             }.get(health_data['status'], '?')
 
             print(f"    [{status_symbol}] Status: {health_data['status'].upper()}")
-            print(f"    CPU: {cpu_data['usage']}% | Memory: {memory_data['usage_percent']}%")
+            print(f"    CPU: {cpu_usage}% | Memory: {memory_usage}%")
             print(f"    Interfaces: {len([i for i in interface_data if i['status'] == 'up'])} up")
 
             if health_data['alerts']:
@@ -132,9 +181,8 @@ class NetworkHealthMonitor:
                 for alert in health_data['alerts']:
                     print(f"      - [{alert['severity'].upper()}] {alert['message']}")
 
-            connection.disconnect()
-
-            self.metrics.append(health_data)
+            with self._metrics_lock:
+                self.metrics.append(health_data)
             return health_data
 
         except Exception as e:
@@ -145,81 +193,136 @@ class NetworkHealthMonitor:
                 'error': str(e),
                 'timestamp': datetime.now().isoformat()
             }
-            self.metrics.append(error_data)
+            with self._metrics_lock:
+                self.metrics.append(error_data)
             print(f"    ✗ Error: {e}")
             return error_data
 
-    def _check_cpu(self, connection, device_type: str) -> Dict:
-        """Check CPU utilization"""
+    def _health_commands(self, device_type: str) -> List[str]:
+        """Show commands needed for a device type's health checks"""
 
+        commands = []
         if device_type.startswith('cisco_ios') or device_type == 'cisco_nxos':
-            output = connection.send_command('show processes cpu')
-
-            # Parse CPU usage (simplified - would need better parsing)
-            for line in output.splitlines():
-                if 'CPU utilization' in line or 'one minute' in line:
-                    # Extract percentage
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if '%' in part and part[:-1].isdigit():
-                            usage = int(part[:-1])
-                            return {'usage': usage, 'raw': line.strip()}
+            commands.append('show processes cpu')
+        if device_type.startswith('cisco_ios'):
+            commands.append('show memory statistics')
+        if device_type.startswith('cisco'):
+            commands.extend(['show ip interface brief', 'show interfaces'])
+        return commands
+
+    def _collect_health_bulk(self, connection, device_type: str, prompt: str) -> Dict[str, str]:
+        """
+        Run all health commands in a single round-trip
+
+        The commands are written to the channel together, then each reply is
+        read up to its closing prompt; Netmiko keeps whatever arrived beyond
+        that prompt buffered for the next read.
+        """
+
+        commands = self._health_commands(device_type)
+        if not commands or not prompt:
+            return {}
+
+        connection.write_channel(connection.RETURN.join(commands) + connection.RETURN)
+
+        outputs = {}
+        for command in commands:
+            reply = connection.read_until_pattern(pattern=re.escape(prompt), read_timeout=60)
+            # Drop the command echo on the first line and the closing prompt
+            outputs[command] = reply.rpartition(prompt)[0].partition('\n')[2]
+        return outputs
+
+    def _check_cpu(self, outputs: Dict[str, str]) -> Dict:
+        """Check CPU utilization"""
+
+        output = outputs.get('show processes cpu')
+        if output:
+            # "CPU utilization for five seconds: 5%/0%; one minute: 3%; ..."
+            match = CPU_ONE_MINUTE_RE.search(output)
+            if match:
+                return {'usage': int(match.group(1)), 'raw': match.group(0).strip()}
 
         return {'usage': 0, 'raw': 'Unable to parse'}
 
-    def _check_memory(self, connection, device_type: str) -> Dict:
+    def _check_memory(self, outputs: Dict[str, str]) -> Dict:
         """Check memory utilization"""
 
-        if device_type.startswith('cisco_ios'):
-            output = connection.send_command('show memory statistics')
-
-            # Parse memory (simplified)
-            for line in output.splitlines():
-                if 'Processor' in line or 'processor' in line:
-                    parts = line.split()
-                    # Look for used/total pattern
-                    for i, part in enumerate(parts):
-                        if part.isdigit() and i + 1 < len(parts):
-                            used = int(part)
-                            total = int(parts[i + 1]) if parts[i + 1].isdigit() else used * 2
-                            usage_percent = int((used / total) * 100) if total > 0 else 0
-                            return {
-                                'used': used,
-                                'total': total,
-                                'usage_percent': usage_percent
-                            }
+        output = outputs.get('show memory statistics')
+        if output:
+            # "Processor  <head>  <total(b)>  <used(b)>  <free(b)> ..."
+            match = PROCESSOR_MEMORY_RE.search(output)
+            if match:
+                total = int(match.group(1))
+                used = int(match.group(2))
+                usage_percent = int((used / total) * 100) if total > 0 else 0
+                return {
+                    'used': used,
+                    'total': total,
+                    'usage_percent': usage_percent
+                }
 
         return {'used': 0, 'total': 0, 'usage_percent': 0}
 
-    def _check_interfaces(self, connection, device_type: str) -> List[Dict]:
+    def _check_interfaces(self, outputs: Dict[str, str]) -> List[Dict]:
         """Check interface status"""
 
         interfaces = []
 
-        if device_type.startswith('cisco'):
-            output = connection.send_command('show ip interface brief')
-
-            for line in output.splitlines():
-                if 'Interface' in line or len(line.strip()) == 0:
-                    continue
-
-                parts = line.split()
-                if len(parts) >= 6:
-                    interfaces.append({
-                        'name': parts[0],
-                        'ip': parts[1] if parts[1] != 'unassigned' else None,
-                        'status': parts[4].lower(),
-                        'protocol': parts[5].lower()
-                    })
+        output = outputs.get('show ip interface brief')
+        if output:
+            for match in INTERFACE_BRIEF_RE.finditer(output):
+                name, ip, status, protocol = match.groups()
+                interfaces.append({
+                    'name': name,
+                    'ip': ip if ip != 'unassigned' else None,
+                    'status': status.lower(),
+                    'protocol': protocol.lower()
+                })
 
             # Get error counts
-            error_output = connection.send_command('show interfaces')
+            error_output = outputs.get('show interfaces', '')
             # Simplified - would need better parsing for actual error counts
             for intf in interfaces:
                 intf['errors'] = 0  # Would parse from output
 
         return interfaces
 
+    async def _ping_async(self, host: str, semaphore: asyncio.Semaphore) -> tuple:
+        """Ping a single host, returning (host, reachable, error)"""
+
+        async with semaphore:
+            try:
+                if icmplib is not None:
+                    try:
+                        reply = await icmplib.async_ping(host, count=1, timeout=1, privileged=False)
+                        return host, reply.is_alive, None
+                    except icmplib.SocketPermissionError:
+                        # Unprivileged ICMP disabled (net.ipv4.ping_group_range), use ping(8)
+                        pass
+
+                proc = await asyncio.create_subprocess_exec(
+                    'ping', '-c', '1', '-W', '1', host,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                try:
+                    returncode = await asyncio.wait_for(proc.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise
+                return host, returncode == 0, None
+
+            except Exception as e:
+                return host, False, str(e) or type(e).__name__
+
+    async def _ping_all(self, hosts: List[str]) -> List[tuple]:
+        """Ping all hosts from one event loop, in input order"""
+
+        # Bound the number of in-flight probes (sockets / child processes)
+        semaphore = asyncio.Semaphore(256)
+        return await asyncio.gather(*(self._ping_async(host, semaphore) for host in hosts))
+
     def check_reachability(self, hosts: List[str]) -> Dict:
         """Check network reachability via ping"""
 
@@ -231,25 +334,16 @@ class NetworkHealthMonitor:
             'unreachable': []
         }
 
-        for host in hosts:
-            try:
-                # Ping the host
-                result = subprocess.run(
-                    ['ping', '-c', '3', '-W', '2', host],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-
-                if result.returncode == 0:
-                    print(f"    ✓ {host} - Reachable")
-                    results['reachable'].append(host)
-                else:
-                    print(f"    ✗ {host} - Unreachable")
-                    results['unreachable'].append(host)
-
-            except Exception as e:
-                print(f"    ✗ {host} - Error: {e}")
+        # Ping all hosts concurrently; results come back in input order
+        for host, reachable, error in asyncio.run(self._ping_all(hosts)):
+            if reachable:
+                print(f"    ✓ {host} - Reachable")
+                results['reachable'].append(host)
+            elif error:
+                print(f"    ✗ {host} - Error: {error}")
+                results['unreachable'].append(host)
+            else:
+                print(f"    ✗ {host} - Unreachable")
                 results['unreachable'].append(host)
 
         print(f"\nReachability: {len(results['reachable'])}/{len(hosts)} hosts up")
@@ -261,20 +355,22 @@ class NetworkHealthMonitor:
 
         print(f"\n[*] Generating health report...")
 
+        # Count statuses in one pass over the metrics
+        counts = Counter(m.get('status', 'unknown') for m in self.metrics)
+
         summary = {
             'timestamp': datetime.now().isoformat(),
             'total_devices': len(self.metrics),
-            'healthy': len([m for m in self.metrics if m.get('status') == 'healthy']),
-            'warning': len([m for m in self.metrics if m.get('status') == 'warning']),
-            'critical': len([m for m in self.metrics if m.get('status') == 'critical']),
-            'error': len([m for m in self.metrics if m.get('status') == 'error']),
+            'healthy': counts['healthy'],
+            'warning': counts['warning'],
+            'critical': counts['critical'],
+            'error': counts['error'],
             'devices': self.metrics
         }
 
         # Save JSON report
         report_file = self.output_dir / f"health_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(summary, f, indent=2)
+        write_json(report_file, summary)
 
         print(f"    ✓ Report saved: {report_file}")
 
@@ -324,8 +420,13 @@ def main():
             inventory = json.load(f)
 
         devices = inventory.get('devices', [])
-        for device in devices:
-            monitor.check_device_health(device)
+
+        # Devices are checked concurrently, one Netmiko session each
+        if devices:
+            with ThreadPoolExecutor(max_workers=default_workers(len(devices))) as executor:
+                futures = [executor.submit(monitor.check_device_health, device) for device in devices]
+                for future in as_completed(futures):
+                    future.result()
 
         monitor.generate_report()
 
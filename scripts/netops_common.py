@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the network automation scripts
+
+Imported by the backup, compliance and monitoring scripts; those in
+subdirectories add this directory to sys.path. Not meant to be run directly.
+"""
+
+import inspect
+import json
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+try:
+    # C JSON serializer, much faster than the json module on large reports
+    import orjson
+except ImportError:
+    orjson = None
+
+# Connect/banner/auth timeout (seconds) of device sessions, so a dead device cannot stall a sweep
+DEVICE_TIMEOUT = 5
+
+
+def default_workers(n_devices: int) -> int:
+    """Thread count for an I/O-bound sweep: 8 per usable CPU, capped at 64 and the device count"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # Not available on macOS / Windows
+        cpus = os.cpu_count()
+    return max(1, min(64, n_devices, (cpus or 4) * 8))
+
+
+def write_json(path: Path, data) -> None:
+    """Write a JSON report (2-space indent), using orjson when installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        # json.dump encodes and writes in chunks, no full-report string
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+@lru_cache(maxsize=1)
+def _netmiko_params() -> frozenset:
+    """Keyword arguments accepted by Netmiko connection classes"""
+    from netmiko import BaseConnection
+    return frozenset(inspect.signature(BaseConnection.__init__).parameters) - {'self'}
+
+
+@contextmanager
+def netmiko_connection(device_info: Dict):
+    """
+    Open a Netmiko session to a device and disconnect it afterwards
+
+    Inventory keys Netmiko does not accept (e.g. 'hostname') are left out.
+    Connect, banner and auth timeouts default to DEVICE_TIMEOUT; inventory
+    values win. The scripts visit each device once per run, so a session
+    is closed as soon as the device is done rather than kept open.
+    """
+    from netmiko import ConnectHandler
+
+    params = _netmiko_params()
+    connection = ConnectHandler(**{
+        key: value
+        for key, value in {
+            'conn_timeout': DEVICE_TIMEOUT,
+            'banner_timeout': DEVICE_TIMEOUT,
+            'auth_timeout': DEVICE_TIMEOUT,
+            **device_info
+        }.items()
+        if key in params
+    })
+
+    try:
+        yield connection
+    finally:
+        try:
+            connection.disconnect()
+        except Exception:
+            pass
@@ -4,98 +4,500 @@ Network Health Checker
 Automated network device health and compliance checking using NAPALM.
 """
 
+import asyncio
 import json
-import yaml
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from napalm import get_network_driver
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+try:
+    # Encodes the streamed per-device report records
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# IF-MIB ifTable columns: interface name and operational status (1 = up)
+IF_DESCR_OID = '1.3.6.1.2.1.2.2.1.2'
+IF_OPER_STATUS_OID = '1.3.6.1.2.1.2.2.1.8'
+
+# Session pool limits: open sessions, seconds unused before closing, seconds before reconnecting
+CONNECTION_POOL_MAX_SIZE = 64
+IDLE_TIMEOUT = 300
+MAX_AGE = 3600
+
+# Longest reuse of cached facts (model, serial, OS version), in seconds. Facts are
+# tied to a pooled session, which is reopened after MAX_AGE, so a longer TTL never applies
+FACTS_TTL = MAX_AGE
+
+# Timeout (seconds) of the TCP probe made before opening a session
+PROBE_TIMEOUT = 3
+
+# NAPALM per-operation timeout (seconds): bounds each getter call, not a device's whole check
+DEVICE_TIMEOUT = 30
+
+# Longest wait (seconds) before retrying a device that keeps failing in watch mode
+MAX_BACKOFF = 300
+
+# Write buffer for the JSON report; per-device writes reach the OS in 1 MiB batches
+REPORT_BUFFER_SIZE = 1 << 20
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[rank - 1]
+
+
+@lru_cache(maxsize=None)
+def _get_driver_cls(device_type):
+    """
+    Return the NAPALM driver class for a device type.
+
+    NAPALM is imported on first use rather than at startup, so --help and
+    early error exits don't pay for its import chain; get_network_driver()
+    then loads only the one vendor driver module that is asked for.
+    """
+    from napalm import get_network_driver
+    return get_network_driver(device_type)
+
+
+@lru_cache(maxsize=1)
+def _snmp_api():
+    """
+    Return pysnmp's asyncio API, or None when pysnmp is not installed.
+
+    SNMP v2c bulk walks read interface state without CLI parsing on the
+    device. Like NAPALM, pysnmp is imported on first use, so --help and
+    runs without SNMP communities don't pay for its import.
+    """
+    try:
+        from pysnmp.hlapi.v3arch import asyncio as hlapi
+    except ImportError:
+        return None
+    return hlapi
+
+
+@lru_cache(maxsize=1)
+def _load_inventory_cached(filepath, mtime_ns):
+    """
+    Parse a YAML inventory with libyaml's C loader when available.
+
+    Cached on (path, mtime), so re-reads of an unchanged file in the same
+    process are free; callers must not modify the result.
+    """
+    import yaml
+
+    with open(filepath) as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+class _Session:
+    """A pooled NAPALM session and its bookkeeping."""
+
+    __slots__ = ('device', 'created', 'last_used', 'lock')
+
+    def __init__(self):
+        self.device = None
+        self.created = 0.0
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+
+
+class DeviceSessionPool:
+    """Keep NAPALM sessions open between uses, keyed by (hostname, username, device_type)."""
+
+    def __init__(self, max_size=CONNECTION_POOL_MAX_SIZE, idle_timeout=IDLE_TIMEOUT, max_age=MAX_AGE,
+                 timeout=DEVICE_TIMEOUT):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.timeout = timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper = None
+
+    @contextmanager
+    def get(self, device_info):
+        """
+        Yield an open session for a device, opening one if needed.
+
+        Each session is used by one thread at a time. Sessions older than
+        max_age or failing is_alive() are reopened, and a session that
+        raises is closed and dropped.
+        """
+        key = (device_info['hostname'], device_info['username'], device_info['device_type'])
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = _Session()
+            self._sessions.move_to_end(key)
+            evicted = self._evict()
+            self._start_reaper()
+
+        for device in evicted:
+            self._close_device(device)
+
+        with session.lock:
+            now = time.monotonic()
+            if session.device is not None and (
+                now - session.created > self.max_age or not self._is_alive(session.device)
+            ):
+                self._close_device(session.device)
+                session.device = None
+
+            if session.device is None:
+                device = _get_driver_cls(device_info['device_type'])(
+                    hostname=device_info['hostname'],
+                    username=device_info['username'],
+                    password=device_info['password'],
+                    timeout=device_info.get('timeout', self.timeout),
+                    optional_args=device_info.get('optional_args', {})
+                )
+                device.open()
+                session.device = device
+                session.created = now
+
+            try:
+                yield session.device
+            except Exception:
+                device, session.device = session.device, None
+                self._close_device(device)
+                raise
+            finally:
+                session.last_used = time.monotonic()
+
+    def _evict(self):
+        """Drop least recently used idle sessions beyond max_size (caller holds the pool lock)."""
+        evicted = []
+        for key in list(self._sessions):
+            if len(self._sessions) <= self.max_size:
+                break
+            session = self._sessions[key]
+            # Skip sessions that are in use
+            if session.lock.acquire(blocking=False):
+                try:
+                    del self._sessions[key]
+                    if session.device is not None:
+                        evicted.append(session.device)
+                    session.device = None
+                finally:
+                    session.lock.release()
+        return evicted
+
+    def _start_reaper(self):
+        """Start the idle-session reaper thread once (caller holds the pool lock)."""
+        if self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap, name='session-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        while not self._closed.wait(min(self.idle_timeout, 60)):
+            self.close_idle()
+
+    def close_idle(self):
+        """Close sessions unused for longer than idle_timeout."""
+        now = time.monotonic()
+        idle = []
+
+        with self._lock:
+            for session in self._sessions.values():
+                # Skip sessions that are in use
+                if session.lock.acquire(blocking=False):
+                    try:
+                        if session.device is not None and now - session.last_used > self.idle_timeout:
+                            idle.append(session.device)
+                            session.device = None
+                    finally:
+                        session.lock.release()
+
+        for device in idle:
+            self._close_device(device)
+
+    @staticmethod
+    def _is_alive(device):
+        try:
+            return device.is_alive().get('is_alive', False)
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_device(device):
+        try:
+            device.close()
+        except Exception:
+            pass
+
+    def is_open(self, device_info):
+        """Whether a session to the device is currently pooled."""
+        key = (device_info['hostname'], device_info['username'], device_info['device_type'])
+        with self._lock:
+            session = self._sessions.get(key)
+        return session is not None and session.device is not None
+
+    def close(self):
+        """Stop the reaper and close all pooled sessions."""
+        self._closed.set()
+
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            with session.lock:
+                if session.device is not None:
+                    self._close_device(session.device)
+                    session.device = None
+
 
 class NetworkHealthChecker:
     """Check network device health and compliance."""
 
-    def __init__(self, inventory_file='tools/inventory/devices.yml'):
+    def __init__(self, inventory_file='tools/inventory/devices.yml', timeout=DEVICE_TIMEOUT):
+        self.inventory_file = inventory_file
         self.inventory = self.load_inventory(inventory_file)
         self.results = []
+        self._results_lock = threading.Lock()
+        # Status histogram of self.results; reset whenever a result is added
+        self._summary_cache: Optional[Counter] = None
+        self.sessions = DeviceSessionPool(timeout=timeout)
+        self._host_locks = {}
+        self._facts_cache = {}
+        self._facts_lock = threading.Lock()
+        # Raw per-stage latencies in nanoseconds, e.g. {'get_facts': [...]}
+        self._stage_ns = defaultdict(list)
+        self._stage_lock = threading.Lock()
+        # Consecutive errors per device, and when it may next be checked (monotonic)
+        self._failures = {}
+        self._backoff_until = {}
 
     def load_inventory(self, filepath):
         """Load device inventory from YAML file."""
         try:
-            with open(filepath) as f:
-                return yaml.safe_load(f)
+            return _load_inventory_cached(filepath, os.stat(filepath).st_mtime_ns)
         except FileNotFoundError:
             print(f"❌ Inventory file not found: {filepath}")
             return {'devices': []}
 
-    def check_device_health(self, device_info):
-        """Perform health checks on a network device."""
-        hostname = device_info['hostname']
-        print(f"\n🔍 Checking {hostname}...")
+    def _record(self, stage, elapsed_ns):
+        """Record one latency sample for a stage."""
+        with self._stage_lock:
+            self._stage_ns[stage].append(elapsed_ns)
 
-        health_report = {
-            'hostname': hostname,
-            'timestamp': datetime.now().isoformat(),
-            'checks': {},
-            'status': 'unknown'
-        }
+    @contextmanager
+    def _time(self, stage):
+        """Time the enclosed block and record it under stage."""
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(stage, time.perf_counter_ns() - started)
+
+    def _host_lock(self, device_info):
+        """
+        Return the lock serializing checks against one physical device.
+
+        Virtual contexts sharing a chassis carry the same 'mgmt_ip' in the
+        inventory; other devices are keyed by hostname.
+        """
+        key = device_info.get('mgmt_ip', device_info['hostname'])
+        return self._host_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _has_capability(device_info, name):
+        """
+        Whether a check applies to a device.
+
+        Inventory entries may list 'capabilities' (e.g. [bgp, environment,
+        ntp]); without that key every check is attempted.
+        """
+        capabilities = device_info.get('capabilities')
+        return capabilities is None or name in capabilities
+
+    @staticmethod
+    def _probe(device_info):
+        """Open and close a TCP connection to the device's management port."""
+        # NAPALM drivers, Junos included, connect on port 22 unless optional_args says otherwise
+        port = (device_info.get('optional_args') or {}).get('port', 22)
 
         try:
-            # Connect to device
-            driver = get_network_driver(device_info['device_type'])
-            device = driver(
-                hostname=hostname,
-                username=device_info['username'],
-                password=device_info['password'],
-                optional_args=device_info.get('optional_args', {})
-            )
-
-            device.open()
-
-            # Check 1: Device Facts
-            print(f"  ✓ Connected successfully")
+            socket.create_connection((device_info['hostname'], port), timeout=PROBE_TIMEOUT).close()
+        except OSError as e:
+            raise ConnectionError(f"TCP port {port} unreachable: {e}") from e
+
+    def _get_facts(self, hostname, device):
+        """
+        Return device facts, calling get_facts() only when needed.
+
+        Facts are reused for up to FACTS_TTL while the device stays on the
+        same pooled session, with uptime advanced by the time elapsed. A
+        reboot drops the session, so a reconnect always refetches.
+        """
+        now = time.time()
+
+        with self._facts_lock:
+            cached = self._facts_cache.get(hostname)
+
+        if cached and cached['device'] is device and now < cached['expires_at']:
+            facts = dict(cached['facts'])
+            facts['uptime'] = int(now - cached['boot_time'])
+            return facts
+
+        with self._time('get_facts'):
             facts = device.get_facts()
-            health_report['checks']['facts'] = {
-                'status': 'pass',
-                'uptime': facts.get('uptime', 0),
-                'model': facts.get('model', 'Unknown'),
-                'serial': facts.get('serial_number', 'Unknown'),
-                'os_version': facts.get('os_version', 'Unknown')
-            }
 
-            # Check uptime (warn if less than 1 hour - possible recent reboot)
-            if facts.get('uptime', 0) < 3600:
-                print(f"  ⚠️  Low uptime: {facts.get('uptime', 0)} seconds")
-                health_report['checks']['uptime_warning'] = True
-
-            # Check 2: Interface Status
-            interfaces = device.get_interfaces()
-            total_interfaces = len(interfaces)
-            up_interfaces = sum(1 for iface in interfaces.values() if iface['is_up'])
-            down_interfaces = total_interfaces - up_interfaces
-
-            health_report['checks']['interfaces'] = {
-                'total': total_interfaces,
-                'up': up_interfaces,
-                'down': down_interfaces,
-                'status': 'pass' if down_interfaces == 0 else 'warning'
+        with self._facts_lock:
+            self._facts_cache[hostname] = {
+                'device': device,
+                'facts': facts,
+                'boot_time': now - facts.get('uptime', 0),
+                'expires_at': now + FACTS_TTL
             }
 
-            if down_interfaces > 0:
-                print(f"  ⚠️  {down_interfaces} interface(s) down")
-                health_report['checks']['down_interfaces'] = [
-                    name for name, data in interfaces.items() if not data['is_up']
-                ]
+        return facts
+
+    def _interfaces_via_snmp(self, device_info):
+        """
+        Read interface state over SNMP v2c in get_interfaces() shape.
+
+        ifDescr and ifOperStatus are walked concurrently with GETBULK, so a
+        typical device answers in one UDP round-trip per column. Requires
+        pysnmp (see _snmp_api()); SNMP failures raise RuntimeError or OSError.
+        """
+        from pysnmp.error import PySnmpError
+
+        try:
+            return asyncio.run(self._interfaces_via_snmp_async(_snmp_api(), device_info))
+        except PySnmpError as e:
+            raise RuntimeError(str(e)) from e
+
+    @staticmethod
+    async def _interfaces_via_snmp_async(hlapi, device_info):
+        engine = hlapi.SnmpEngine()
+        auth = hlapi.CommunityData(device_info['snmp_community'], mpModel=1)
+        target = await hlapi.UdpTransportTarget.create((device_info['hostname'], 161), timeout=2, retries=1)
+
+        async def walk(oid):
+            """Walk one ifTable column, returning {ifIndex: value}."""
+            column = {}
+            async for error_indication, error_status, _, var_binds in hlapi.bulk_walk_cmd(
+                engine, auth, target, hlapi.ContextData(), 0, 50,
+                hlapi.ObjectType(hlapi.ObjectIdentity(oid)),
+                lexicographicMode=False
+            ):
+                if error_indication or error_status:
+                    raise RuntimeError(f"SNMP: {error_indication or error_status.prettyPrint()}")
+                for name, value in var_binds:
+                    column[name[-1]] = value
+            return column
+
+        try:
+            names, oper_status = await asyncio.gather(walk(IF_DESCR_OID), walk(IF_OPER_STATUS_OID))
+        finally:
+            engine.close_dispatcher()
+
+        return {
+            str(name): {'is_up': int(oper_status.get(index, 2)) == 1}
+            for index, name in names.items()
+        }
+
+    def _run_checks(self, device_info, device, health_report, lines):
+        """
+        Run the health checks against an open NAPALM session.
+
+        Results go into health_report['checks'] and output into lines;
+        returns the (has_warning, has_critical) flags for the overall status.
+        """
+        # Imported here rather than at module load, like the NAPALM drivers
+        from napalm.base.exceptions import CommandErrorException
+
+        hostname = device_info['hostname']
+
+        # Set by the checks below as they find problems
+        has_warning = False
+        has_critical = False
+
+        # Check 1: Device Facts
+        lines.append(f"  ✓ Connected successfully")
+        facts = self._get_facts(hostname, device)
+        health_report['checks']['facts'] = {
+            'status': 'pass',
+            'uptime': facts.get('uptime', 0),
+            'model': facts.get('model', 'Unknown'),
+            'serial': facts.get('serial_number', 'Unknown'),
+            'os_version': facts.get('os_version', 'Unknown')
+        }
+
+        # Check uptime (warn if less than 1 hour - possible recent reboot)
+        if facts.get('uptime', 0) < 3600:
+            lines.append(f"  ⚠️  Low uptime: {facts.get('uptime', 0)} seconds")
+            health_report['checks']['uptime_warning'] = True
+            has_warning = True
+
+        # Check 2: Interface Status
+        if device_info.get('snmp_community') and _snmp_api() is not None:
+            try:
+                with self._time('snmp_interfaces'):
+                    interfaces = self._interfaces_via_snmp(device_info)
+            except (RuntimeError, OSError) as e:
+                # SNMP is only a shortcut; the NAPALM session is still good
+                lines.append(f"  ⚠️  SNMP failed ({e}), using get_interfaces()")
+                interfaces = None
+        else:
+            interfaces = None
+
+        if interfaces is None:
+            with self._time('get_interfaces'):
+                interfaces = device.get_interfaces()
+        total_interfaces = len(interfaces)
+        down_list = [name for name, data in interfaces.items() if not data['is_up']]
+        down_interfaces = len(down_list)
+        up_interfaces = total_interfaces - down_interfaces
+
+        health_report['checks']['interfaces'] = {
+            'total': total_interfaces,
+            'up': up_interfaces,
+            'down': down_interfaces,
+            'status': 'pass' if down_interfaces == 0 else 'warning'
+        }
+
+        if down_interfaces > 0:
+            lines.append(f"  ⚠️  {down_interfaces} interface(s) down")
+            health_report['checks']['down_interfaces'] = down_list
+            has_warning = True
 
-            # Check 3: BGP Neighbors (if applicable)
+        # Check 3: BGP Neighbors (if applicable)
+        if not self._has_capability(device_info, 'bgp'):
+            health_report['checks']['bgp'] = {'status': 'not_configured'}
+        else:
             try:
-                bgp_neighbors = device.get_bgp_neighbors()
+                with self._time('get_bgp_neighbors'):
+                    bgp_neighbors = device.get_bgp_neighbors()
                 if bgp_neighbors:
-                    total_neighbors = sum(len(peers) for peers in bgp_neighbors.values())
-                    established = sum(
-                        1 for peers in bgp_neighbors.values()
-                        for peer in peers.values()
-                        if peer.get('is_up', False)
-                    )
+                    # {vrf: {'router_id': ..., 'peers': {address: {...}}}}, counted in one pass
+                    total_neighbors = 0
+                    established = 0
+                    for peer in chain.from_iterable(
+                        vrf['peers'].values() for vrf in bgp_neighbors.values()
+                    ):
+                        total_neighbors += 1
+                        if peer.get('is_up', False):
+                            established += 1
 
                     health_report['checks']['bgp'] = {
                         'total_neighbors': total_neighbors,
@@ -104,45 +506,65 @@ class NetworkHealthChecker:
                     }
 
                     if total_neighbors != established:
-                        print(f"  ❌ BGP: {total_neighbors - established} neighbor(s) down")
-            except:
+                        lines.append(f"  ❌ BGP: {total_neighbors - established} neighbor(s) down")
+                        has_critical = True
+            except (NotImplementedError, CommandErrorException):
                 health_report['checks']['bgp'] = {'status': 'not_configured'}
 
-            # Check 4: Environment (Temperature, Power, Fans)
+        # Check 4: Environment (Temperature, Power, Fans)
+        if not self._has_capability(device_info, 'environment'):
+            health_report['checks']['environment'] = {'status': 'not_available'}
+        else:
             try:
-                environment = device.get_environment()
+                with self._time('get_environment'):
+                    environment = device.get_environment()
+
+                checks = health_report['checks']
 
                 # Check CPU
-                if 'cpu' in environment:
-                    for cpu_name, cpu_data in environment['cpu'].items():
-                        cpu_usage = cpu_data.get('%usage', 0)
+                cpus = environment.get('cpu')
+                if cpus:
+                    for cpu_name, cpu_data in cpus.items():
+                        cpu_usage = cpu_data.get('%usage') or 0
                         if cpu_usage > 80:
-                            print(f"  ⚠️  High CPU usage: {cpu_usage}%")
-                            health_report['checks']['high_cpu'] = cpu_usage
-
-                # Check Memory
-                if 'memory' in environment:
-                    for mem_name, mem_data in environment['memory'].items():
-                        mem_usage = mem_data.get('used_ram', 0) / mem_data.get('available_ram', 1) * 100
+                            lines.append(f"  ⚠️  High CPU usage: {cpu_usage}%")
+                            checks['high_cpu'] = cpu_usage
+                            has_warning = True
+
+                # Check Memory ({'available_ram': ..., 'used_ram': ...}); some
+                # platforms report available_ram as 0, which gives no usable figure
+                mem_data = environment.get('memory')
+                if mem_data:
+                    used = mem_data.get('used_ram') or 0
+                    avail = mem_data.get('available_ram') or 0
+                    if avail:
+                        mem_usage = used * 100.0 / avail
                         if mem_usage > 80:
-                            print(f"  ⚠️  High memory usage: {mem_usage:.1f}%")
-                            health_report['checks']['high_memory'] = mem_usage
+                            lines.append(f"  ⚠️  High memory usage: {mem_usage:.1f}%")
+                            checks['high_memory'] = mem_usage
+                            has_warning = True
 
                 # Check Temperature
-                if 'temperature' in environment:
-                    for sensor, temp_data in environment['temperature'].items():
-                        temp = temp_data.get('temperature', 0)
+                temperatures = environment.get('temperature')
+                if temperatures:
+                    for sensor, temp_data in temperatures.items():
+                        temp = temp_data.get('temperature') or 0
                         if temp > 75:
-                            print(f"  ⚠️  High temperature: {sensor} = {temp}°C")
-                            health_report['checks']['high_temp'] = {sensor: temp}
+                            lines.append(f"  ⚠️  High temperature: {sensor} = {temp}°C")
+                            checks['high_temp'] = {sensor: temp}
+                            has_warning = True
 
-                health_report['checks']['environment'] = {'status': 'pass'}
-            except:
+                checks['environment'] = {'status': 'pass'}
+            except (NotImplementedError, CommandErrorException):
                 health_report['checks']['environment'] = {'status': 'not_available'}
 
-            # Check 5: NTP Status
+        # Check 5: NTP Status
+        if not self._has_capability(device_info, 'ntp'):
+            health_report['checks']['ntp'] = {'status': 'not_configured'}
+        else:
             try:
-                ntp_stats = device.get_ntp_stats()
+                with self._time('get_ntp_stats'):
+                    ntp_stats = device.get_ntp_stats()
                 if ntp_stats:
                     synced_peers = [
                         peer for peer, data in ntp_stats.items()
@@ -154,49 +576,159 @@ class NetworkHealthChecker:
                     }
 
                     if not synced_peers:
-                        print(f"  ❌ NTP not synchronized")
-            except:
+                        lines.append(f"  ❌ NTP not synchronized")
+                        has_critical = True
+            except (NotImplementedError, CommandErrorException):
                 health_report['checks']['ntp'] = {'status': 'not_configured'}
 
-            device.close()
+        return has_warning, has_critical
 
-            # Determine overall status
-            failed_checks = [
-                name for name, check in health_report['checks'].items()
-                if isinstance(check, dict) and check.get('status') == 'fail'
-            ]
+    def check_device_health(self, device_info, run_timestamp=None):
+        """
+        Perform health checks on a network device.
+
+        'timestamp' is the run's start time, shared by all devices of a
+        sweep; 'duration_ms' is how long this device took.
+        """
+        hostname = device_info['hostname']
+        # Output is collected and logged once per device, so concurrent
+        # workers don't interleave their lines
+        lines = [f"\n🔍 Checking {hostname}..."]
+        started = time.monotonic()
+
+        health_report = {
+            'hostname': hostname,
+            'timestamp': run_timestamp or datetime.now().isoformat(),
+            'checks': {},
+            'status': 'unknown'
+        }
+
+        try:
+            # Fail fast on unreachable devices, before paying for SSH/NETCONF setup
+            if not self.sessions.is_open(device_info):
+                with self._time('probe'):
+                    self._probe(device_info)
 
-            if failed_checks:
+            # Get a pooled session; contexts of one chassis are polled one at a time
+            session_started = time.perf_counter_ns()
+            with self._host_lock(device_info), self.sessions.get(device_info) as device:
+                # Waiting for the chassis lock plus connecting, if not pooled
+                self._record('session', time.perf_counter_ns() - session_started)
+
+                has_warning, has_critical = self._run_checks(device_info, device, health_report, lines)
+
+            # Determine overall status from the flags set by the checks
+            if has_critical:
                 health_report['status'] = 'critical'
-                print(f"  ❌ Overall Status: CRITICAL")
-            elif any(k.startswith('high_') or 'warning' in k for k in health_report['checks'].keys()):
+                lines.append(f"  ❌ Overall Status: CRITICAL")
+            elif has_warning:
                 health_report['status'] = 'warning'
-                print(f"  ⚠️  Overall Status: WARNING")
+                lines.append(f"  ⚠️  Overall Status: WARNING")
             else:
                 health_report['status'] = 'healthy'
-                print(f"  ✅ Overall Status: HEALTHY")
+                lines.append(f"  ✅ Overall Status: HEALTHY")
 
         except Exception as e:
             health_report['status'] = 'error'
             health_report['error'] = str(e)
-            print(f"  ❌ Error: {e}")
+            lines.append(f"  ❌ Error: {e}")
+        finally:
+            logger.info('\n'.join(lines))
+
+        health_report['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
 
-        self.results.append(health_report)
+        with self._results_lock:
+            self.results.append(health_report)
+            self._summary_cache = None
         return health_report
 
-    def check_all_devices(self):
-        """Check health of all devices in inventory."""
+    def check_all_devices(self, workers=16):
+        """Check health of all devices in inventory, several at a time."""
         devices = self.inventory.get('devices', [])
 
         if not devices:
             print("❌ No devices in inventory")
             return
 
+        # Devices that keep failing are retried with exponential backoff
+        now = time.monotonic()
+        backing_off = [d for d in devices if self._backoff_until.get(d['hostname'], 0) > now]
+        if backing_off:
+            devices = [d for d in devices if self._backoff_until.get(d['hostname'], 0) <= now]
+            print(f"⏳ Skipping {len(backing_off)} device(s) in backoff: "
+                  f"{', '.join(d['hostname'] for d in backing_off)}")
+            if not devices:
+                return
+
         print(f"Starting health checks for {len(devices)} devices...")
         print("="*80)
 
-        for device in devices:
-            self.check_device_health(device)
+        run_timestamp = datetime.now().isoformat()
+
+        # Devices are checked concurrently, each worker with its own NAPALM session
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(devices)))) as executor:
+            futures = [
+                executor.submit(self.check_device_health, device, run_timestamp)
+                for device in devices
+            ]
+            for future in as_completed(futures):
+                self._track_failures(future.result())
+
+    def _track_failures(self, report):
+        """Update a device's backoff from the status of its latest check."""
+        hostname = report['hostname']
+        if report['status'] != 'error':
+            self._failures.pop(hostname, None)
+            self._backoff_until.pop(hostname, None)
+            return
+
+        failures = self._failures[hostname] = self._failures.get(hostname, 0) + 1
+        self._backoff_until[hostname] = time.monotonic() + min(MAX_BACKOFF, 2 ** failures)
+
+    def reset_results(self):
+        """Forget results and latency samples, ready for the next sweep."""
+        with self._results_lock:
+            self.results = []
+            self._summary_cache = None
+        with self._stage_lock:
+            self._stage_ns.clear()
+
+    def watch(self, interval=60, jitter=5, workers=16, export=None):
+        """
+        Check all devices every interval seconds until interrupted.
+
+        Sessions, cached facts and the parsed inventory carry over between
+        sweeps; the inventory is re-read only when the file changes. A
+        random delay of up to jitter seconds keeps sweeps from several
+        checkers from lining up on the devices.
+        """
+        while True:
+            self.inventory = self.load_inventory(self.inventory_file)
+            self.reset_results()
+            self.check_all_devices(workers=workers)
+            self.generate_summary()
+
+            if export:
+                self.export_json(export)
+
+            time.sleep(interval + random.uniform(0, jitter))
+
+    def close(self):
+        """Close pooled device sessions."""
+        self.sessions.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _summary(self) -> Counter:
+        """Count results by status in a single pass, cached until the next result."""
+        with self._results_lock:
+            if self._summary_cache is None:
+                self._summary_cache = Counter(r['status'] for r in self.results)
+            return self._summary_cache
 
     def generate_summary(self):
         """Generate summary report."""
@@ -207,10 +739,11 @@ class NetworkHealthChecker:
         print("Network Health Summary")
         print("="*80)
 
-        healthy = sum(1 for r in self.results if r['status'] == 'healthy')
-        warning = sum(1 for r in self.results if r['status'] == 'warning')
-        critical = sum(1 for r in self.results if r['status'] == 'critical')
-        error = sum(1 for r in self.results if r['status'] == 'error')
+        summary = self._summary()
+        healthy = summary['healthy']
+        warning = summary['warning']
+        critical = summary['critical']
+        error = summary['error']
 
         total = len(self.results)
 
@@ -227,24 +760,50 @@ class NetworkHealthChecker:
                 if result['status'] == 'critical':
                     print(f"  - {result['hostname']}")
 
+        # Per-stage latency percentiles, to find the devices/calls driving the tail
+        with self._stage_lock:
+            stages = {stage: sorted(samples) for stage, samples in self._stage_ns.items()}
+        if stages:
+            print("\nStage Latency (ms):")
+            print(f"  {'stage':<20} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+            for stage, samples in sorted(stages.items()):
+                p50, p95, p99 = (_percentile(samples, pct) / 1e6 for pct in (50, 95, 99))
+                print(f"  {stage:<20} {len(samples):>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f}")
+
         print("\n" + "="*80)
 
     def export_json(self, filename='network-health-report.json'):
-        """Export results to JSON."""
-        report = {
+        """
+        Export results to JSON.
+
+        Devices are serialized and written one at a time, one per line, so
+        the full report never exists as a single string; a large write
+        buffer batches those small writes into few system calls.
+        """
+        summary = self._summary()
+        header = {
             'report_date': datetime.now().isoformat(),
             'total_devices': len(self.results),
             'summary': {
-                'healthy': sum(1 for r in self.results if r['status'] == 'healthy'),
-                'warning': sum(1 for r in self.results if r['status'] == 'warning'),
-                'critical': sum(1 for r in self.results if r['status'] == 'critical'),
-                'error': sum(1 for r in self.results if r['status'] == 'error'),
-            },
-            'devices': self.results
+                'healthy': summary['healthy'],
+                'warning': summary['warning'],
+                'critical': summary['critical'],
+                'error': summary['error'],
+            }
         }
 
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            dumps = lambda obj: json.dumps(obj).encode()
+
+        with open(filename, 'wb', buffering=REPORT_BUFFER_SIZE) as f:
+            # Header object without its closing brace, then the devices array
+            f.write(dumps(header)[:-1] + b', "devices": [')
+            for i, result in enumerate(self.results):
+                f.write(b'\n' if i == 0 else b',\n')
+                f.write(dumps(result))
+            f.write(b'\n]}\n')
 
         print(f"\n📄 Detailed report saved to {filename}")
 
@@ -257,15 +816,35 @@ def main():
     parser.add_argument('--inventory', default='tools/inventory/devices.yml',
                        help='Path to inventory file')
     parser.add_argument('--export', help='Export results to JSON file')
+    parser.add_argument('--workers', type=int, default=16,
+                       help='Number of devices to check concurrently')
+    parser.add_argument('--timeout', type=int, default=DEVICE_TIMEOUT,
+                       help='NAPALM per-operation timeout in seconds (applies to each getter call)')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep checking devices until interrupted')
+    parser.add_argument('--interval', type=float, default=60,
+                       help='Seconds between sweeps in watch mode')
+    parser.add_argument('--jitter', type=float, default=5,
+                       help='Maximum random seconds added to each watch interval')
 
     args = parser.parse_args()
 
-    checker = NetworkHealthChecker(inventory_file=args.inventory)
-    checker.check_all_devices()
-    checker.generate_summary()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+    with NetworkHealthChecker(inventory_file=args.inventory, timeout=args.timeout) as checker:
+        if args.watch:
+            try:
+                checker.watch(interval=args.interval, jitter=args.jitter,
+                              workers=args.workers, export=args.export)
+            except KeyboardInterrupt:
+                print("\nStopped watching")
+            return
+
+        checker.check_all_devices(workers=args.workers)
+        checker.generate_summary()
 
-    if args.export:
-        checker.export_json(args.export)
+        if args.export:
+            checker.export_json(args.export)
 
 
 if __name__ == '__main__':